@@ -11,36 +11,64 @@ from __future__ import annotations
 import argparse
 import json
 import sys
+from collections import Counter
 from pathlib import Path
 
-from .models import LegalNode, NodeStatus, NodeType, ParsedTaxCode
+from .models import LegalNode, NodeStatus, ParsedTaxCode
 from .parser import parse_tax_code
 
+# Optional fast JSON encoder for exports (pip install orjson)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Both encoders indent by two spaces, like json.dump(..., indent=2), and write
+# non-ASCII characters ("§", "—") as raw UTF-8, so the export does not depend
+# on whether orjson is installed
+def _stdlib_json_bytes(obj: object) -> bytes:
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+if ORJSON_AVAILABLE:
+    def _json_bytes(obj: object) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+else:
+    _json_bytes = _stdlib_json_bytes
+
 
 def print_hierarchy(node: LegalNode, indent: int = 0, max_depth: int = 4) -> None:
     """Print the hierarchy of nodes in a tree format."""
-    if indent > max_depth * 2:
+    max_indent = max_depth * 2
+    if indent > max_indent:
         return
 
-    prefix = "  " * indent
-    status_marker = " [REPEALED]" if node.status == NodeStatus.REPEALED else ""
-
-    # Format the node display
-    if node.heading:
-        display = f"{node.node_type.value}: {node.num or ''} - {node.heading}{status_marker}"
-    else:
-        display = f"{node.node_type.value}: {node.num or node.id}{status_marker}"
+    # Collect the lines and write them in one call instead of one print per line
+    lines: list[str] = []
+    stack = [(node, indent)]
+    while stack:
+        node, indent = stack.pop()
+        prefix = "  " * indent
+        status_marker = " [REPEALED]" if node.status == NodeStatus.REPEALED else ""
+
+        # Format the node display
+        if node.heading:
+            display = f"{node.node_type.value}: {node.num or ''} - {node.heading}{status_marker}"
+        else:
+            display = f"{node.node_type.value}: {node.num or node.id}{status_marker}"
 
-    print(f"{prefix}{display}")
+        lines.append(f"{prefix}{display}\n")
 
-    # Show references if any
-    if node.references and indent <= max_depth * 2:
+        # Show references if any
         for ref in node.references[:3]:  # Limit to first 3 refs
-            print(f"{prefix}  -> References: Section {ref.target_section} ({ref.reference_type})")
+            lines.append(f"{prefix}  -> References: Section {ref.target_section} ({ref.reference_type})\n")
+
+        # Descend into children (in order) unless they would be past max_depth
+        if indent < max_indent:
+            stack.extend((child, indent + 1) for child in reversed(node.children))
 
-    # Recurse into children
-    for child in node.children:
-        print_hierarchy(child, indent + 1, max_depth)
+    sys.stdout.write("".join(lines))
 
 
 def print_statistics(parsed: ParsedTaxCode) -> None:
@@ -55,32 +83,22 @@ def print_statistics(parsed: ParsedTaxCode) -> None:
     if parsed.repealed_sections:
         print(f"  Examples: {', '.join(parsed.repealed_sections[:5])}")
 
-    # Count references
-    all_refs = parsed.get_all_references()
-    print(f"Total cross-references found: {len(all_refs)}")
-
-    # Group references by type
-    ref_types: dict[str, int] = {}
-    for _, ref in all_refs:
-        ref_types[ref.reference_type] = ref_types.get(ref.reference_type, 0) + 1
+    # Count references, grouped by type
+    ref_types: Counter[str] = Counter(ref.reference_type for _, ref in parsed.iter_all_references())
+    print(f"Total cross-references found: {ref_types.total()}")
 
     if ref_types:
         print("Reference types:")
-        for ref_type, count in sorted(ref_types.items(), key=lambda x: -x[1]):
-            print(f"  - {ref_type}: {count}")
-
-    # Count by node type
-    def count_by_type(node: LegalNode, counts: dict[str, int]) -> None:
-        counts[node.node_type.value] = counts.get(node.node_type.value, 0) + 1
-        for child in node.children:
-            count_by_type(child, counts)
-
-    type_counts: dict[str, int] = {}
-    count_by_type(parsed.root, type_counts)
+        sys.stdout.write("".join(
+            f"  - {ref_type}: {count}\n"
+            for ref_type, count in sorted(ref_types.items(), key=lambda x: -x[1])
+        ))
 
     print("\nNodes by type:")
-    for node_type, count in sorted(type_counts.items()):
-        print(f"  - {node_type}: {count}")
+    sys.stdout.write("".join(
+        f"  - {node_type}: {count}\n"
+        for node_type, count in sorted((t.value, c) for t, c in parsed.count_by_type().items())
+    ))
 
 
 def print_section_details(node: LegalNode) -> None:
@@ -109,35 +127,80 @@ def print_section_details(node: LegalNode) -> None:
             print(f"  - {child.num}: {child.heading or '(no heading)'}")
 
 
+def _node_header(node: LegalNode, depth: int) -> bytes:
+    """
+    Encode a node's fields as an open JSON object ending in '"children": ['.
+
+    The object is indented for nesting ``depth`` levels deep, two spaces per level.
+    """
+    fields = {
+        "id": node.id,
+        "identifier": node.identifier,
+        "type": node.node_type.value,
+        "num": node.num,
+        "heading": node.heading,
+        "text": node.text[:200] + "..." if len(node.text) > 200 else node.text,
+        "status": node.status.value,
+        "hierarchical_path": node.hierarchical_path,
+        "references": [
+            {"target": ref.target_section, "type": ref.reference_type}
+            for ref in node.references
+        ],
+    }
+    # Indent every line for the depth (JSON strings never contain raw newlines),
+    # then drop the closing brace so the children array can be streamed after it
+    newline = b"\n" + b"  " * depth
+    encoded = _json_bytes(fields).replace(b"\n", newline)
+    return encoded[:-len(newline) - 1] + b"," + newline + b'  "children": ['
+
+
 def export_to_json(parsed: ParsedTaxCode, output_path: Path) -> None:
-    """Export the parsed structure to JSON for inspection."""
-    def node_to_dict(node: LegalNode) -> dict:
-        return {
-            "id": node.id,
-            "identifier": node.identifier,
-            "type": node.node_type.value,
-            "num": node.num,
-            "heading": node.heading,
-            "text": node.text[:200] + "..." if len(node.text) > 200 else node.text,
-            "status": node.status.value,
-            "hierarchical_path": node.hierarchical_path,
-            "references": [
-                {"target": ref.target_section, "type": ref.reference_type}
-                for ref in node.references
-            ],
-            "children": [node_to_dict(child) for child in node.children],
-        }
-
-    data = {
+    """
+    Export the parsed structure to JSON for inspection.
+
+    The node tree is streamed to the file one node at a time (iteratively, in
+    document order) rather than built up as one nested dict, so memory stays
+    proportional to the tree depth instead of the number of nodes. The output
+    is indented by two spaces per level, as json.dump(..., indent=2) writes it.
+    """
+    header = {
         "title": parsed.title,
         "total_sections": parsed.total_sections,
         "total_nodes": parsed.total_nodes,
         "repealed_sections": parsed.repealed_sections,
-        "root": node_to_dict(parsed.root),
     }
 
-    with open(output_path, "w") as f:
-        json.dump(data, f, indent=2)
+    with open(output_path, "wb") as f:
+        # Drop the header's closing "\n}" and continue with the root node
+        f.write(_json_bytes(header)[:-2] + b',\n  "root": ')
+
+        # Walk the flat node store through its CSR child ranges (the root is at position 0).
+        # Pending work: node positions to emit with their depth, or raw bytes (separators and closers)
+        nodes = parsed.nodes
+        offsets, children_index = parsed.child_ranges()
+        stack: list[tuple[int, int] | bytes] = [(0, 1)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, bytes):
+                f.write(item)
+                continue
+
+            position, depth = item
+            f.write(_node_header(nodes[position], depth))
+            closing = b"\n" + b"  " * depth + b"}"
+            first, end = offsets[position], offsets[position + 1]
+            if first == end:
+                f.write(b"]" + closing)
+                continue
+
+            # Children are array items, two levels below the node's opening brace
+            stack.append(b"\n" + b"  " * (depth + 1) + b"]" + closing)
+            child_newline = b"\n" + b"  " * (depth + 2)
+            for slot in range(end - 1, first - 1, -1):
+                stack.append((children_index[slot], depth + 2))
+                stack.append(b"," + child_newline if slot > first else child_newline)
+
+        f.write(b"\n}")
 
     print(f"\nExported to: {output_path}")
 
@@ -159,6 +222,15 @@ def main() -> int:
         default=50,
         help="Maximum number of sections to parse (default: 50)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Worker processes for parsing chapters (with --max-sections 0) and extracting "
+            "cross-references; only faster on multi-core machines (default: parse in this process)"
+        ),
+    )
     parser.add_argument(
         "--output",
         type=Path,
@@ -185,7 +257,7 @@ def main() -> int:
     print()
 
     try:
-        parsed = parse_tax_code(args.xml_path, max_sections=args.max_sections)
+        parsed = parse_tax_code(args.xml_path, max_sections=args.max_sections, workers=args.workers)
     except FileNotFoundError as e:
         print(f"Error: {e}", file=sys.stderr)
         return 1
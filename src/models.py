@@ -1,17 +1,25 @@
 """
-Pydantic models for US Tax Code (Title 26) hierarchical structure.
+Models for US Tax Code (Title 26) hierarchical structure.
 
 The hierarchy follows:
 Title > Subtitle > Chapter > Subchapter > Part > Subpart > Section > Subsection > Paragraph
+
+Tree nodes (LegalNode, Reference) are slotted dataclasses: the parser builds tens of
+thousands of them programmatically, so they skip validation. ParsedTaxCode, the
+container handed to callers, remains a Pydantic model.
 """
 
 from __future__ import annotations
 
 import re
+import sys
+from array import array
+from dataclasses import dataclass, field
 from enum import Enum
-from typing import Optional
+from itertools import accumulate
+from typing import Annotated, Iterator, Optional, Sequence
 
-from pydantic import BaseModel, Field, computed_field
+from pydantic import BaseModel, Field, PrivateAttr, computed_field, field_validator
 
 
 class NodeType(str, Enum):
@@ -37,11 +45,50 @@ class NodeStatus(str, Enum):
     RESERVED = "reserved"
 
 
-class Reference(BaseModel):
-    """A cross-reference to another section in the tax code."""
-    target_section: str = Field(description="The section being referenced (e.g., '162', '274(a)(3)')")
-    context: str = Field(description="The surrounding text containing the reference")
-    reference_type: str = Field(default="general", description="Type of reference: 'definition', 'exception', 'subject_to', 'general'")
+# One-byte codes for NodeType, used by ParsedTaxCode's per-node type buffer
+_NODE_TYPES: tuple[NodeType, ...] = tuple(NodeType)
+_NODE_TYPE_CODES: dict[NodeType, int] = {node_type: code for code, node_type in enumerate(_NODE_TYPES)}
+
+
+# Container nodes (Title, Subtitle, Chapter, etc.)
+CONTAINER_NODE_TYPES = frozenset({
+    NodeType.TITLE, NodeType.SUBTITLE, NodeType.CHAPTER,
+    NodeType.SUBCHAPTER, NodeType.PART, NodeType.SUBPART,
+})
+
+# Content nodes (Section, Subsection, Paragraph, etc.)
+CONTENT_NODE_TYPES = frozenset({
+    NodeType.SECTION, NodeType.SUBSECTION, NodeType.PARAGRAPH,
+    NodeType.SUBPARAGRAPH, NodeType.CLAUSE,
+})
+
+
+@dataclass(slots=True, eq=False)
+class Reference:
+    """
+    A cross-reference to another section in the tax code.
+
+    The surrounding context is not copied out of the source text: the reference
+    keeps the (shared) text it was found in plus slice bounds, and `context`
+    builds the snippet on demand. Serialized references carry only `context`,
+    not the source text and bounds; validating a dumped ParsedTaxCode keeps that
+    context as the source text.
+    """
+    # The section being referenced (e.g., '162', '274(a)(3)')
+    target_section: str
+    # Type of reference: 'definition', 'exception', 'subject_to', 'general'
+    reference_type: str = "general"
+    # The text the reference was found in (the owning node's text) and the
+    # bounds of the surrounding context within it
+    source_text: Annotated[str, Field(exclude=True)] = field(default="", repr=False)
+    context_start: Annotated[int, Field(exclude=True)] = 0
+    context_end: Annotated[int, Field(exclude=True)] = 0
+
+    @computed_field
+    @property
+    def context(self) -> str:
+        """The surrounding text containing the reference."""
+        return f"...{self.source_text[self.context_start:self.context_end].strip()}..."
 
     def __hash__(self):
         return hash((self.target_section, self.reference_type))
@@ -52,7 +99,29 @@ class Reference(BaseModel):
         return self.target_section == other.target_section and self.reference_type == other.reference_type
 
 
-class LegalNode(BaseModel):
+@dataclass(slots=True, frozen=True)
+class PathLink:
+    """
+    One segment of a hierarchical path, linked to its parent's path.
+
+    Children share their parent's link instead of copying the whole prefix,
+    so a path costs one small object per node rather than a string of
+    O(depth) length.
+    """
+    parent: Optional[PathLink]
+    segment: str
+
+    def __str__(self) -> str:
+        segments = []
+        link: Optional[PathLink] = self
+        while link is not None:
+            segments.append(link.segment)
+            link = link.parent
+        return " > ".join(reversed(segments))
+
+
+@dataclass(slots=True)
+class LegalNode:
     """
     A node in the tax code hierarchy.
 
@@ -63,45 +132,70 @@ class LegalNode(BaseModel):
     - Cross-references to other sections
     - Child nodes for traversal
     """
-    id: str = Field(description="Official citation (e.g., '26 USC 162(a)')")
-    identifier: str = Field(description="XML identifier path (e.g., '/us/usc/t26/s162/a')")
-    node_type: NodeType = Field(description="Type of this node in the hierarchy")
-    num: Optional[str] = Field(default=None, description="Section/subsection number (e.g., '162', '(a)')")
-    heading: Optional[str] = Field(default=None, description="Title/heading of this node")
-    text: str = Field(default="", description="Raw legal text content (cleaned of XML tags)")
-    status: NodeStatus = Field(default=NodeStatus.ACTIVE, description="Whether this section is active, repealed, etc.")
+    # Official citation (e.g., '26 USC 162(a)')
+    id: str
+    # XML identifier path (e.g., '/us/usc/t26/s162/a')
+    identifier: str
+    # Type of this node in the hierarchy
+    node_type: NodeType
+    # Section/subsection number (e.g., '162', '(a)')
+    num: Optional[str] = None
+    # Title/heading of this node
+    heading: Optional[str] = None
+    # Raw legal text content (cleaned of XML tags)
+    text: str = ""
+    # Whether this section is active, repealed, etc.
+    status: NodeStatus = NodeStatus.ACTIVE
 
     # Hierarchy
-    parent_id: Optional[str] = Field(default=None, description="ID of the parent node")
-    children: list[LegalNode] = Field(default_factory=list, description="Child nodes")
+    parent_id: Optional[str] = None
+    # A list while the parser appends to it, a tuple once the node is complete
+    children: Sequence[LegalNode] = ()
+
+    # Cross-references to other sections (empty tuple when there are none)
+    references: Sequence[Reference] = ()
+
+    # Metadata: path from the root, shared with the ancestors. Serialized as
+    # the joined hierarchical_path string rather than the chain of links, and
+    # rebuilt from that string when a dumped ParsedTaxCode is validated.
+    path: Annotated[Optional[PathLink], Field(exclude=True)] = None
+
+    # Memoized derived text (see full_text / embedding_text); not serialized
+    _full_text: Annotated[Optional[str], Field(exclude=True)] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _embedding_text: Annotated[Optional[str], Field(exclude=True)] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    # Set from node_type at construction (see is_container / is_content); not serialized
+    _is_container: Annotated[bool, Field(exclude=True)] = field(
+        default=False, init=False, repr=False, compare=False
+    )
+    _is_content: Annotated[bool, Field(exclude=True)] = field(
+        default=False, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self._is_container = self.node_type in CONTAINER_NODE_TYPES
+        self._is_content = self.node_type in CONTENT_NODE_TYPES
 
-    # Cross-references
-    references: list[Reference] = Field(default_factory=list, description="Cross-references to other sections")
-
-    # Metadata
-    hierarchical_path: str = Field(default="", description="String path (e.g., 'Subtitle A > Chapter 1 > Section 162')")
-
-    model_config = {"arbitrary_types_allowed": True}
-
-    @computed_field
     @property
     def is_container(self) -> bool:
         """Returns True if this is a container node (Title, Subtitle, Chapter, etc.)."""
-        return self.node_type in {
-            NodeType.TITLE, NodeType.SUBTITLE, NodeType.CHAPTER,
-            NodeType.SUBCHAPTER, NodeType.PART, NodeType.SUBPART
-        }
+        return self._is_container
 
-    @computed_field
     @property
     def is_content(self) -> bool:
         """Returns True if this is a content node (Section, Subsection, Paragraph)."""
-        return self.node_type in {
-            NodeType.SECTION, NodeType.SUBSECTION, NodeType.PARAGRAPH,
-            NodeType.SUBPARAGRAPH, NodeType.CLAUSE
-        }
+        return self._is_content
 
     @computed_field
+    @property
+    def hierarchical_path(self) -> str:
+        """String path (e.g., 'Subtitle A > Chapter 1 > Section 162'), joined on access."""
+        return str(self.path) if self.path is not None else ""
+
     @property
     def is_leaf(self) -> bool:
         """Returns True if this node has no children."""
@@ -110,13 +204,18 @@ class LegalNode(BaseModel):
     @computed_field
     @property
     def full_text(self) -> str:
-        """Returns text with heading prepended for context."""
-        parts = []
-        if self.heading:
-            parts.append(self.heading)
-        if self.text:
-            parts.append(self.text)
-        return " - ".join(parts) if parts else ""
+        """
+        Returns text with heading prepended for context.
+        Computed on first access and memoized (nodes are not modified after parsing).
+        """
+        if self._full_text is None:
+            parts = []
+            if self.heading:
+                parts.append(self.heading)
+            if self.text:
+                parts.append(self.text)
+            self._full_text = " - ".join(parts) if parts else ""
+        return self._full_text
 
     @computed_field
     @property
@@ -124,42 +223,53 @@ class LegalNode(BaseModel):
         """
         Returns the text to be used for vector embedding.
         Includes hierarchical context for better semantic search.
+        Computed on first access and memoized (nodes are not modified after parsing).
         """
-        context_parts = []
-        if self.hierarchical_path:
-            context_parts.append(self.hierarchical_path)
-        if self.heading:
-            context_parts.append(self.heading)
-        if self.text:
-            context_parts.append(self.text)
-        return " > ".join(context_parts[:2]) + ": " + (context_parts[2] if len(context_parts) > 2 else "")
+        if self._embedding_text is None:
+            context_parts = []
+            hierarchical_path = self.hierarchical_path
+            if hierarchical_path:
+                context_parts.append(hierarchical_path)
+            if self.heading:
+                context_parts.append(self.heading)
+            if self.text:
+                context_parts.append(self.text)
+            self._embedding_text = (
+                " > ".join(context_parts[:2]) + ": " + (context_parts[2] if len(context_parts) > 2 else "")
+            )
+        return self._embedding_text
 
     def get_all_sections(self) -> list[LegalNode]:
-        """Recursively get all section-level nodes."""
+        """Get all section-level nodes, in document order."""
         sections = []
-        if self.node_type == NodeType.SECTION:
-            sections.append(self)
-        for child in self.children:
-            sections.extend(child.get_all_sections())
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.node_type == NodeType.SECTION:
+                sections.append(node)
+            stack.extend(reversed(node.children))
         return sections
 
     def get_all_leaf_nodes(self) -> list[LegalNode]:
-        """Recursively get all leaf nodes (for embedding)."""
-        if self.is_leaf:
-            return [self]
+        """Get all leaf nodes (for embedding), in document order."""
         leaves = []
-        for child in self.children:
-            leaves.extend(child.get_all_leaf_nodes())
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.children:
+                stack.extend(reversed(node.children))
+            else:
+                leaves.append(node)
         return leaves
 
     def find_by_id(self, target_id: str) -> Optional[LegalNode]:
         """Find a node by its ID."""
-        if self.id == target_id:
-            return self
-        for child in self.children:
-            result = child.find_by_id(target_id)
-            if result:
-                return result
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node.id == target_id:
+                return node
+            stack.extend(reversed(node.children))
         return None
 
     def to_dict_flat(self) -> dict:
@@ -174,7 +284,14 @@ class LegalNode(BaseModel):
             "status": self.status.value,
             "parent_id": self.parent_id,
             "hierarchical_path": self.hierarchical_path,
-            "references": [ref.model_dump() for ref in self.references],
+            "references": [
+                {
+                    "target_section": ref.target_section,
+                    "context": ref.context,
+                    "reference_type": ref.reference_type,
+                }
+                for ref in self.references
+            ],
             "child_ids": [child.id for child in self.children],
         }
 
@@ -187,50 +304,212 @@ class ParsedTaxCode(BaseModel):
     total_nodes: int = Field(default=0, description="Total number of nodes parsed")
     repealed_sections: list[str] = Field(default_factory=list, description="List of repealed section IDs")
 
+    # Lookup structures built once in model_post_init (the tree is not modified after parsing).
+    # _nodes holds every node in document order; the children of _nodes[i] are
+    # _nodes[j] for j in _children_index[_children_offsets[i]:_children_offsets[i + 1]].
+    _id_index: dict[str, LegalNode] = PrivateAttr(default_factory=dict)
+    _sections: list[LegalNode] = PrivateAttr(default_factory=list)
+    _nodes: list[LegalNode] = PrivateAttr(default_factory=list)
+    _children_offsets: array = PrivateAttr(default_factory=lambda: array("i"))
+    _children_index: array = PrivateAttr(default_factory=lambda: array("i"))
+    # _type_codes[i] is the _NODE_TYPE_CODES entry for _nodes[i]
+    _type_codes: bytes = PrivateAttr(default=b"")
+
+    @field_validator("root", mode="before")
+    @classmethod
+    def _restore_dumped_tree(cls, value):
+        """Accept a dumped tree (see _restore_dumped_tree) as well as a LegalNode."""
+        return _restore_dumped_tree(value) if isinstance(value, dict) else value
+
+    def model_post_init(self, __context) -> None:
+        """
+        Flatten the tree in document order, indexing nodes by ID and collecting sections.
+
+        The child ranges of the flat list are stored CSR-style: one offset per
+        node into a single array of child positions.
+        """
+        id_index = self._id_index
+        sections = self._sections
+        nodes = self._nodes
+        type_codes = bytearray()
+        # Position of each node's parent in nodes (-1 for the root)
+        parent_positions = array("i")
+        stack = [(self.root, -1)]
+        while stack:
+            node, parent_position = stack.pop()
+            position = len(nodes)
+            nodes.append(node)
+            parent_positions.append(parent_position)
+            type_codes.append(_NODE_TYPE_CODES[node.node_type])
+            # Keep the first node in document order if an ID repeats, like find_by_id
+            id_index.setdefault(node.id, node)
+            if node.node_type == NodeType.SECTION:
+                sections.append(node)
+            stack.extend((child, position) for child in reversed(node.children))
+        self._type_codes = bytes(type_codes)
+
+        # Each node's children follow it in document order, so filling every
+        # parent's range in node order keeps the children in order too
+        self._children_offsets = offsets = array(
+            "i", accumulate((len(node.children) for node in nodes), initial=0)
+        )
+        self._children_index = index = array("i", [0]) * offsets[-1]
+        next_slot = offsets.tolist()
+        for position, parent_position in enumerate(parent_positions):
+            if parent_position >= 0:
+                index[next_slot[parent_position]] = position
+                next_slot[parent_position] += 1
+
+    def count_by_type(self) -> dict[NodeType, int]:
+        """Count nodes per type, omitting types that do not occur."""
+        codes = self._type_codes
+        counts = {node_type: codes.count(code) for code, node_type in enumerate(_NODE_TYPES)}
+        return {node_type: count for node_type, count in counts.items() if count}
+
+    def iter_nodes(self) -> Iterator[LegalNode]:
+        """Iterate over every node in document order."""
+        return iter(self._nodes)
+
+    @property
+    def nodes(self) -> Sequence[LegalNode]:
+        """Every node in document order, by position (see child_positions); read-only."""
+        return self._nodes
+
+    def child_positions(self, position: int) -> array:
+        """Positions in `nodes` of the children of the node at ``position``, in order."""
+        offsets = self._children_offsets
+        return self._children_index[offsets[position]:offsets[position + 1]]
+
+    def child_ranges(self) -> tuple[array, array]:
+        """
+        The CSR child ranges as (offsets, index), for walks over the whole tree.
+
+        The children of nodes[i] are nodes[index[k]] for k in range(offsets[i], offsets[i + 1]).
+        """
+        return self._children_offsets, self._children_index
+
+    def get_node(self, node_id: str) -> Optional[LegalNode]:
+        """Get any node by its ID (e.g., '26 USC 162(a)')."""
+        return self._id_index.get(node_id)
+
     def get_section(self, section_num: str) -> Optional[LegalNode]:
         """Get a section by its number (e.g., '162', '274')."""
-        target_id = f"26 USC {section_num}"
-        return self.root.find_by_id(target_id)
+        return self._id_index.get(f"26 USC {section_num}")
 
     def get_all_sections(self) -> list[LegalNode]:
         """Get all section-level nodes."""
-        return self.root.get_all_sections()
+        return list(self._sections)
+
+    def iter_all_references(self) -> Iterator[tuple[str, Reference]]:
+        """Iterate over all cross-references with their source node IDs, in document order."""
+        for node in self._nodes:
+            node_id = node.id
+            for ref in node.references:
+                yield node_id, ref
 
     def get_all_references(self) -> list[tuple[str, Reference]]:
         """Get all cross-references with their source node IDs."""
-        refs = []
+        return list(self.iter_all_references())
 
-        def collect_refs(node: LegalNode):
-            for ref in node.references:
-                refs.append((node.id, ref))
-            for child in node.children:
-                collect_refs(child)
-
-        collect_refs(self.root)
-        return refs
-
-
-# Reference detection patterns
-SECTION_REFERENCE_PATTERNS = [
-    # "section 162" or "Section 162"
-    (r'\bsection\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'general'),
-    # "sections 162 and 274"
-    (r'\bsections?\s+(\d+[A-Za-z]?)\s+(?:and|or)\s+(\d+[A-Za-z]?)', 'general'),
-    # "sec. 162" or "Sec. 162"
-    (r'\bsec\.\s*(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'general'),
-    # "as defined in section 7701"
-    (r'as defined in section\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'definition'),
-    # "subject to section 274" or "subject to the provisions of section 274"
-    (r'subject to (?:the provisions of )?section\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'subject_to'),
-    # "except as provided in section 274"
-    (r'except as provided in section\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'exception'),
-    # "under section 162"
-    (r'under section\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'general'),
-    # "provided in section 162"
-    (r'provided in section\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'general'),
-    # "see section 162"
-    (r'see section\s+(\d+[A-Za-z]?(?:\([a-z0-9]+\))*)', 'general'),
-]
+
+def _restore_dumped_tree(root: dict) -> dict:
+    """
+    Rewrite a dumped node tree (model_dump() or JSON) into LegalNode input.
+
+    The dump carries the derived hierarchical_path and Reference.context rather
+    than the fields they are computed from. Each node's path is rebuilt as a link
+    to its parent's path plus the segment its string adds, and each reference
+    keeps its context as its source text, so both come back unchanged. The input
+    dicts are copied, not modified.
+    """
+    root = dict(root)
+    # (node dict, parent's path link, parent's path string)
+    stack: list[tuple[dict, Optional[PathLink], str]] = [(root, None, "")]
+    while stack:
+        node, parent_path, parent_string = stack.pop()
+        hierarchical_path = node.pop("hierarchical_path", "") or ""
+        if "path" not in node and hierarchical_path:
+            prefix = parent_string + " > "
+            if parent_path is not None and hierarchical_path.startswith(prefix):
+                node["path"] = PathLink(parent_path, hierarchical_path[len(prefix):])
+            else:
+                node["path"] = PathLink(None, hierarchical_path)
+        path = node.get("path") if isinstance(node.get("path"), PathLink) else None
+
+        references = node.get("references")
+        if references:
+            # Keep the container (list or tuple) the references were dumped in
+            node["references"] = type(references)(
+                _restore_dumped_reference(ref) if isinstance(ref, dict) else ref
+                for ref in references
+            )
+
+        children = node.get("children")
+        if children:
+            # Finished nodes hold their children as a tuple, as the parser leaves them
+            node["children"] = children = tuple(
+                dict(child) if isinstance(child, dict) else child for child in children
+            )
+            stack.extend(
+                (child, path, hierarchical_path) for child in children if isinstance(child, dict)
+            )
+    return root
+
+
+def _restore_dumped_reference(ref: dict) -> dict:
+    """Rewrite a dumped reference's context into source text and bounds (see Reference.context)."""
+    ref = dict(ref)
+    context = ref.pop("context", None)
+    if context is not None and "source_text" not in ref:
+        # context is "..." + the stripped slice + "..."
+        if len(context) >= 6 and context.startswith("...") and context.endswith("..."):
+            context = context[3:-3]
+        ref.update(source_text=context, context_start=0, context_end=len(context))
+    return ref
+
+
+# Section number as cited in running text (e.g., "162", "25A", "274(a)(3)")
+_SECTION_NUMBER = r"\d+[A-Za-z]?(?:\([a-z0-9]+\))*"
+
+# Reference detection pattern. Every citation is anchored on the literal keyword
+# "section"/"sections"/"sec.", so the engine only starts a match attempt where
+# that keyword occurs instead of trying an alternation at every position:
+#   "section 162", "Sec. 162", "sections 162 and 274"
+# Other phrasings ("under section 162", "see section 162", ...) are general
+# references; qualifying phrases are recognized from the text just before the
+# keyword (see _QUALIFIERS).
+#
+# The pattern starts with a character class rather than \b and a global
+# IGNORECASE flag: that lets the re module skip ahead to the next "s"/"S" in C
+# instead of attempting a match at every position. The word boundary becomes a
+# lookbehind and the rest of the pattern is matched case-insensitively as before.
+SECTION_REFERENCE_PATTERN = re.compile(
+    r"""
+    [Ss][Ee][Cc] (?<! \w[Ss][Ee][Cc] )      # keyword at a word boundary
+    (?i:
+        (?: tions?\s+ | \.\s* )              # "section 162", "sections 162", "sec. 162"
+        (?P<section> """ + _SECTION_NUMBER + r""" )  # "162", "25A", "274(a)(3)"
+        (?P<pair>                            # "sections 162 and 274"
+            \s+ (?: and | or ) \s+
+            (?P<other> \d+[A-Za-z]? )
+        )?
+    )
+    """,
+    re.VERBOSE,
+)
+
+# Phrases that qualify a citation when they directly precede the keyword, checked
+# longest first:
+#   "as defined in section 7701"                        -> definition
+#   "subject to (the provisions of) section 274"        -> subject_to
+#   "except as provided in section 274"                 -> exception
+_QUALIFIERS = (
+    ("subject to the provisions of ", "subject_to"),
+    ("except as provided in ", "exception"),
+    ("as defined in ", "definition"),
+    ("subject to ", "subject_to"),
+)
+_QUALIFIER_WINDOW = max(len(phrase) for phrase, _ in _QUALIFIERS)
 
 
 def extract_references(text: str) -> list[Reference]:
@@ -243,25 +522,40 @@ def extract_references(text: str) -> list[Reference]:
     if not text:
         return []
 
-    references = []
-    seen = set()
-
-    for pattern, ref_type in SECTION_REFERENCE_PATTERNS:
-        for match in re.finditer(pattern, text, re.IGNORECASE):
-            # Get all captured groups (some patterns capture multiple sections)
-            groups = match.groups()
-            for section in groups:
-                if section and section not in seen:
-                    seen.add(section)
-                    # Get context (surrounding 50 chars)
-                    start = max(0, match.start() - 30)
-                    end = min(len(text), match.end() + 30)
-                    context = text[start:end].strip()
-
-                    references.append(Reference(
-                        target_section=section,
-                        context=f"...{context}...",
-                        reference_type=ref_type
-                    ))
-
-    return references
+    # Deduplicated on (target_section, reference_type), the same key Reference
+    # uses for equality; the first occurrence of each key is kept.
+    found: dict[tuple[str, str], Reference] = {}
+
+    for match in SECTION_REFERENCE_PATTERN.finditer(text):
+        section, pair, other = match.groups()
+        match_start, match_end = match.span()
+
+        ref_type = "general"
+        preceding = text[max(0, match_start - _QUALIFIER_WINDOW):match_start].lower()
+        for phrase, qualified_type in _QUALIFIERS:
+            if preceding.endswith(phrase):
+                ref_type = qualified_type
+                match_start -= len(phrase)
+                break
+
+        if pair and section.endswith(")"):
+            # Only a bare section number starts a pair; in "section 26(a) or 15
+            # percent" the trailing number is not a citation.
+            other = None
+            match_end -= len(pair)
+
+        # Some matches cite two sections ("sections 162 and 274")
+        for cited in (section, other):
+            if cited and (cited, ref_type) not in found:
+                found[cited, ref_type] = Reference(
+                    # Popular targets (61, 162, 7701, ...) are cited all over the
+                    # code; interning keeps a single copy of each string.
+                    target_section=sys.intern(cited),
+                    reference_type=ref_type,
+                    # Context: surrounding 30 chars
+                    source_text=text,
+                    context_start=max(0, match_start - 30),
+                    context_end=min(len(text), match_end + 30),
+                )
+
+    return list(found.values())
@@ -7,10 +7,15 @@ Law Revision Counsel (OLRC) into structured LegalNode objects.
 
 from __future__ import annotations
 
+import contextlib
 import html
+import io
 import re
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Callable, Optional
 
 from lxml import etree
 
@@ -19,6 +24,7 @@ from .models import (
     NodeStatus,
     NodeType,
     ParsedTaxCode,
+    PathLink,
     Reference,
     extract_references,
 )
@@ -48,6 +54,132 @@ CONTAINER_ELEMENTS = {"title", "subtitle", "chapter", "subchapter", "part", "sub
 # Elements that are content units
 CONTENT_ELEMENTS = {"section", "subsection", "paragraph", "subparagraph", "clause"}
 
+# "Sec. " prefix stripped from a num used as the citation ID
+SEC_PREFIX_PATTERN = re.compile(r"^Sec\.?\s*")
+
+# First nested table, bare or XHTML (compiled once; runs in C)
+XHTML_NS = "http://www.w3.org/1999/xhtml"
+FIND_NESTED_TABLE = etree.XPath("(.//table | .//xhtml:table)[1]", namespaces={"xhtml": XHTML_NS})
+
+# Common values of the status attribute
+STATUS_ATTRIBUTE_MAP = {
+    "repealed": NodeStatus.REPEALED,
+    "repeal": NodeStatus.REPEALED,
+    "expired": NodeStatus.EXPIRED,
+    "reserved": NodeStatus.RESERVED,
+}
+
+# Direct children read for every node, mapped from the tag to its local name.
+# The namespace is chosen once per document from the root element (see _stream).
+USLM_PREFIX = f"{{{USLM_NS}}}"
+USLM_METADATA_TAGS = {f"{USLM_PREFIX}{name}": name for name in ("num", "heading", "content")}
+BARE_METADATA_TAGS = {name: name for name in ("num", "heading", "content")}
+
+# Root element tags. Titles in other namespaces (e.g. dc:title in <meta>) are
+# document metadata, never the root.
+USLM_TITLE_TAG = f"{USLM_PREFIX}title"
+TITLE_TAGS = frozenset({USLM_TITLE_TAG, "title"})
+MAIN_TAGS = frozenset({f"{USLM_PREFIX}main", "main"})
+
+# Lookup by the tag as lxml reports it (Clark notation in the USLM namespace,
+# or a bare name), so the common case needs no local-name split
+TAG_TO_NODE_TYPE = {
+    **ELEMENT_TO_NODE_TYPE,
+    **{f"{{{USLM_NS}}}{name}": node_type for name, node_type in ELEMENT_TO_NODE_TYPE.items()},
+}
+
+# Path segment label of each node type ("Section: Tax imposed", "Paragraph (1)")
+TYPE_LABELS = {node_type: node_type.value.capitalize() for node_type in NodeType}
+
+# iterparse tag filter: structural elements in any (or no) namespace
+STRUCTURAL_TAGS = [f"{{*}}{name}" for name in ELEMENT_TO_NODE_TYPE]
+
+# libxml2 settings for the streaming parse. Comments and processing instructions
+# are dropped while parsing, huge_tree lifts the depth and text-size limits a
+# full title can exceed, and collect_ids=False skips building the xml:id hash
+# table (elements are never looked up by ID). Internal entities are still
+# resolved (lxml's default): unresolved entity nodes would drop their text from
+# the direct-text path of _extract_text. remove_blank_text is not used either:
+# whitespace-only text between elements (e.g. between table rows in itertext)
+# separates words.
+ITERPARSE_OPTIONS = dict(
+    remove_comments=True,
+    remove_pis=True,
+    huge_tree=True,
+    collect_ids=False,
+)
+
+# Node texts handed to each worker process at a time when extracting in parallel
+REFERENCE_CHUNK_SIZE = 500
+
+
+def _reference_spans(text: str) -> list[tuple[str, str, int, int]]:
+    """
+    Extract references from text as plain tuples (runs in worker processes).
+
+    Returns (target_section, reference_type, context_start, context_end) for each
+    reference, so the text itself is not pickled back to the parent process.
+    """
+    return [
+        (ref.target_section, ref.reference_type, ref.context_start, ref.context_end)
+        for ref in extract_references(text)
+    ]
+
+
+def _local(tag: str) -> str:
+    """Local name of an element tag ("{ns}section" -> "section", "section" -> "section")."""
+    # rfind is -1 for bare tags, so the slice starts at 0
+    return tag[tag.rfind("}") + 1:]
+
+
+def _is_main_title(elem: etree._Element) -> bool:
+    """Root rule: a USLM or bare title element directly under a USLM or bare <main>."""
+    parent = elem.getparent()
+    return elem.tag in TITLE_TAGS and parent is not None and parent.tag in MAIN_TAGS
+
+
+def _is_uslm_title(elem: etree._Element) -> bool:
+    """Root rule: any title element in the USLM namespace."""
+    return elem.tag == USLM_TITLE_TAG
+
+
+def _is_bare_title(elem: etree._Element) -> bool:
+    """Root rule: any title element without a namespace."""
+    return elem.tag == "title"
+
+
+def _is_any_element(elem: etree._Element) -> bool:
+    """Root rule: the first structural element (a serialized subtree)."""
+    return True
+
+
+# Root rules tried in turn: the title directly under <main>, then the first
+# USLM title anywhere in the document, then the first bare title
+ROOT_RULES = (_is_main_title, _is_uslm_title, _is_bare_title)
+
+
+# An identifier parsed for citation IDs: (identifier, number of path segments,
+# section parts such as ("162", "(a)"), whether the section segment was seen)
+_CitationParts = tuple[str, int, tuple[str, ...], bool]
+
+
+@dataclass(slots=True)
+class _Frame:
+    """A structural element that is still open while streaming the document."""
+    elem: etree._Element
+    node_type: Optional[NodeType] = None
+    # ID and path of the parent node, known when the frame is pushed
+    parent_id: Optional[str] = None
+    parent_path: Optional[PathLink] = None
+    # Parsed identifier of the parent (see _citation_parts), extended for this node
+    parent_citation: Optional[_CitationParts] = None
+    citation: Optional[_CitationParts] = None
+    node: Optional[LegalNode] = None
+    # Past the section limit: the element and its subtree are ignored
+    skip: bool = False
+    # Chapter handed to a worker process as a whole (see _submit_chapter)
+    deferred: bool = False
+
 
 class USLMParser:
     """
@@ -57,15 +189,34 @@ class USLMParser:
     extracting metadata, text content, and cross-references.
     """
 
-    def __init__(self, max_sections: Optional[int] = None):
+    def __init__(self, max_sections: Optional[int] = None, workers: Optional[int] = None):
         """
         Initialize the parser.
 
         Args:
             max_sections: Maximum number of sections to parse (for testing).
                          If None, parses all sections.
+            workers: Number of worker processes. If greater than 1, chapters are
+                    parsed in parallel (only when max_sections is None, since the
+                    limit depends on document order) and the remaining nodes'
+                    cross-references are extracted in parallel. If None or 1,
+                    everything is parsed inline. This process still reads the
+                    whole document and unpickles the chapter trees, so the
+                    speedup is bounded (about 2x) and needs several cores.
         """
         self.max_sections = max_sections
+        self.workers = workers
+        # Nodes whose references are extracted after parsing (when workers > 1)
+        self._pending_references: list[LegalNode] = []
+        # References already extracted during this parse, by node text
+        self._reference_cache: dict[str, list[Reference]] = {}
+        # Pool for chapter subtrees, and the submitted chapters as (parent node,
+        # index in parent.children, future, index in repealed_sections, and the
+        # parent path and ID the chapter was parsed with)
+        self._chapter_executor: Optional[ProcessPoolExecutor] = None
+        self._chapter_jobs: list[tuple[LegalNode, int, Future, int, Optional[PathLink], str]] = []
+        # Metadata child tags for the document's namespace, set from its root element
+        self._metadata_tags: dict[str, str] = USLM_METADATA_TAGS
         self.sections_parsed = 0
         self.total_nodes = 0
         self.repealed_sections: list[str] = []
@@ -84,35 +235,30 @@ class USLMParser:
         if not xml_path.exists():
             raise FileNotFoundError(f"XML file not found: {xml_path}")
 
-        tree = etree.parse(str(xml_path))
-        root = tree.getroot()
-
-        # Find the main content (title element)
-        # Try with namespace first, then without
-        main = root.find(".//uslm:main", NAMESPACES)
-        if main is None:
-            main = root.find(".//main")
-
-        title_elem = None
-        if main is not None:
-            title_elem = main.find("uslm:title", NAMESPACES)
-            if title_elem is None:
-                title_elem = main.find("title")
-
-        if title_elem is None:
-            # Try finding title directly under root
-            title_elem = root.find(".//uslm:title", NAMESPACES)
-            if title_elem is None:
-                title_elem = root.find(".//title")
-
-        if title_elem is None:
-            raise ValueError("Could not find title element in XML")
-
-        # Parse the title and its descendants
-        root_node = self._parse_element(title_elem, parent_path="")
-
-        if root_node is None:
-            raise ValueError("Failed to parse root title element")
+        parallel = self.workers is not None and self.workers > 1
+        with ProcessPoolExecutor(max_workers=self.workers) if parallel else contextlib.nullcontext() as executor:
+            self._chapter_executor = executor if not self.max_sections else None
+            try:
+                # The root is the title element directly under <main>; if there
+                # is none, fall back to the first USLM title in the document,
+                # then to the first bare title (see ROOT_RULES)
+                root_node = None
+                for is_root in ROOT_RULES:
+                    root_node = self._stream(str(xml_path), is_root)
+                    if root_node is not None:
+                        break
+            finally:
+                self._chapter_executor = None
+                self._reference_cache = {}
+
+            if root_node is None:
+                raise ValueError("Could not find title element in XML")
+
+            self._merge_chapters()
+
+            if self._pending_references:
+                self._extract_references_parallel(executor, self._pending_references)
+                self._pending_references = []
 
         return ParsedTaxCode(
             title="Title 26 - Internal Revenue Code",
@@ -122,108 +268,290 @@ class USLMParser:
             repealed_sections=self.repealed_sections,
         )
 
-    def _parse_element(
+    def _stream(
         self,
-        elem: etree._Element,
-        parent_path: str,
-        parent_id: Optional[str] = None,
+        source: str | BinaryIO,
+        is_root: Callable[[etree._Element], bool],
+        root_parent_id: Optional[str] = None,
+        root_parent_path: Optional[PathLink] = None,
     ) -> Optional[LegalNode]:
         """
-        Recursively parse an XML element into a LegalNode.
+        Build the node tree from iterparse events instead of a full DOM.
+
+        Each open structural element has a frame on the stack. Its LegalNode is
+        created once the element's num and heading have been read (at the start
+        of its first structural child, or at its own end), and its text, status
+        and references are filled in at its end, along with a num or heading
+        that only follows the structural children. Finished elements are cleared
+        and detached, so only the currently open path stays in memory.
+
+        Only structural elements that are direct children of an open node become
+        nodes; ones nested in other markup stay part of their parent's text.
 
         Args:
-            elem: The XML element to parse.
-            parent_path: The hierarchical path of the parent.
-            parent_id: The ID of the parent node.
+            source: File name or binary file object to parse.
+            is_root: Predicate selecting the root element (_is_main_title, ...).
+            root_parent_id: Parent ID for the root node (for subtrees).
+            root_parent_path: Parent path for the root node (for subtrees).
 
         Returns:
-            LegalNode or None if element should be skipped.
+            The root LegalNode, or None if no root element was found.
         """
-        # Check if we've hit the section limit
-        if self.max_sections and self.sections_parsed >= self.max_sections:
-            return None
-
-        # Get the local name (without namespace)
-        tag = etree.QName(elem.tag).localname if isinstance(elem.tag, str) else elem.tag
+        frames: list[_Frame] = []
+
+        events = etree.iterparse(source, events=("start", "end"), tag=STRUCTURAL_TAGS, **ITERPARSE_OPTIONS)
+        for event, elem in events:
+            if event == "start":
+                if not frames:
+                    if not is_root(elem):
+                        continue
+                    # USLM documents are namespaced throughout; others use bare tags
+                    self._metadata_tags = (
+                        USLM_METADATA_TAGS if elem.tag.startswith(USLM_PREFIX) else BARE_METADATA_TAGS
+                    )
+                    parent_id, parent_path, parent_citation = root_parent_id, root_parent_path, None
+                elif frames[-1].skip or frames[-1].deferred or elem.getparent() is not frames[-1].elem:
+                    continue
+                # Once the section limit is hit, every later element is skipped
+                # (including the children of the section that reached it)
+                elif self.max_sections and self.sections_parsed >= self.max_sections:
+                    frames.append(_Frame(elem, skip=True))
+                    continue
+                else:
+                    parent = frames[-1]
+                    self._open_node(parent)
+                    parent_id, parent_path, parent_citation = parent.node.id, parent.node.path, parent.citation
+
+                node_type = TAG_TO_NODE_TYPE.get(elem.tag) or ELEMENT_TO_NODE_TYPE[_local(elem.tag)]
+                frame = _Frame(
+                    elem,
+                    node_type=node_type,
+                    parent_id=parent_id,
+                    parent_path=parent_path,
+                    parent_citation=parent_citation,
+                )
+                frames.append(frame)
+                # Chapters are independent subtrees; parse them in the pool
+                if len(frames) > 1 and node_type == NodeType.CHAPTER and self._chapter_executor is not None:
+                    frame.deferred = True
+                    continue
+                if node_type == NodeType.SECTION:
+                    self.sections_parsed += 1
+                self.total_nodes += 1
+                continue
 
-        # Skip elements that aren't part of the hierarchy
-        if tag not in ELEMENT_TO_NODE_TYPE:
-            return None
+            # "end": only elements that were pushed as frames are handled
+            if not frames or elem is not frames[-1].elem:
+                continue
+            frame = frames.pop()
 
-        node_type = ELEMENT_TO_NODE_TYPE[tag]
+            if frame.deferred:
+                self._submit_chapter(frame, frames[-1].node)
+            elif not frame.skip:
+                node = self._close_node(frame)
+                if not frames:
+                    return node
+                frames[-1].node.children.append(node)
 
-        # Extract identifier
-        identifier = elem.get("identifier", "")
+            # Free the finished subtree
+            elem.clear()
+            elem.getparent().remove(elem)
 
-        # Extract num and heading
-        num = self._get_text_content(elem, "num")
-        heading = self._get_text_content(elem, "heading")
+        return None
 
-        # Determine status
-        status = self._determine_status(elem)
+    def _submit_chapter(self, frame: _Frame, parent: LegalNode) -> None:
+        """Serialize a finished chapter element and parse it in a worker process."""
+        xml_bytes = etree.tostring(frame.elem, with_tail=False)
+        future = self._chapter_executor.submit(_parse_subtree, xml_bytes, frame.parent_id, frame.parent_path)
+        # Keep the chapter's place among its siblings and among the repealed sections
+        parent.children.append(None)
+        self._chapter_jobs.append(
+            (parent, len(parent.children) - 1, future, len(self.repealed_sections), frame.parent_path, frame.parent_id)
+        )
 
-        # Build the hierarchical path
-        path_parts = []
-        if parent_path:
-            path_parts.append(parent_path)
-        if heading:
-            path_parts.append(f"{node_type.value.capitalize()}: {heading}")
-        elif num:
-            path_parts.append(f"{node_type.value.capitalize()} {num}")
-        hierarchical_path = " > ".join(path_parts)
+    def _merge_chapters(self) -> None:
+        """Put the chapters parsed by worker processes into the tree, in document order."""
+        # Newest first, so the recorded repealed_sections positions stay valid
+        for parent, index, future, repealed_index, parent_path, parent_id in reversed(self._chapter_jobs):
+            node, sections_parsed, total_nodes, repealed_sections = future.result()
+            # The chapter's chain ends in an unpickled copy of the parent path it
+            # was sent with, and the parent's num or heading may have been
+            # completed since. Hang the chapter on the parent's current path and ID.
+            _reanchor(node, _path_depth(parent_path), parent.path)
+            if node.parent_id == parent_id:
+                node.parent_id = parent.id
+            children = parent.children
+            parent.children = children[:index] + (node,) + children[index + 1:]
+            self.sections_parsed += sections_parsed
+            self.total_nodes += total_nodes
+            self.repealed_sections[repealed_index:repealed_index] = repealed_sections
+        self._chapter_jobs = []
+
+    def _open_node(self, frame: _Frame, metadata: Optional[dict[str, etree._Element]] = None) -> None:
+        """
+        Create the LegalNode for a frame from its identifier, num and heading.
 
-        # Build the official citation ID
-        node_id = self._build_citation_id(node_type, num, identifier)
+        Text, status and references are added when the element ends.
+        """
+        if frame.node is not None:
+            return
 
-        # Extract text content
-        text = self._extract_text(elem)
+        elem = frame.elem
+        node_type = frame.node_type
+        if metadata is None:
+            metadata = self._find_metadata_children(elem)
 
-        # Extract cross-references
-        references = extract_references(text)
+        # Extract identifier
+        identifier = elem.get("identifier", "")
 
-        # Track sections
-        if node_type == NodeType.SECTION:
-            self.sections_parsed += 1
-            if status == NodeStatus.REPEALED:
-                self.repealed_sections.append(node_id)
+        # Extract num and heading
+        num = self._get_text_content(metadata, "num")
+        heading = self._get_text_content(metadata, "heading")
 
-        self.total_nodes += 1
+        # Build the official citation ID
+        frame.citation = self._citation_parts(identifier, frame.parent_citation)
+        node_id = self._build_citation_id(node_type, num, identifier, frame.citation)
 
-        # Create the node
-        node = LegalNode(
+        frame.node = LegalNode(
             id=node_id,
             identifier=identifier,
             node_type=node_type,
             num=num,
             heading=heading,
-            text=text,
-            status=status,
-            parent_id=parent_id,
-            hierarchical_path=hierarchical_path,
-            references=references,
+            parent_id=frame.parent_id,
+            path=self._build_path(frame.parent_path, node_type, num, heading),
             children=[],
         )
 
-        # Parse children
-        for child_elem in elem:
-            child_tag = etree.QName(child_elem.tag).localname if isinstance(child_elem.tag, str) else child_elem.tag
-            if child_tag in ELEMENT_TO_NODE_TYPE:
-                child_node = self._parse_element(
-                    child_elem,
-                    parent_path=hierarchical_path,
-                    parent_id=node_id,
-                )
-                if child_node:
-                    node.children.append(child_node)
+    def _update_node(self, frame: _Frame, metadata: dict[str, etree._Element]) -> None:
+        """
+        Complete the num and heading of a node opened before its element ended.
+
+        A node is opened at the start of its first structural child, when only
+        the part of the element that libxml2 has already read is available. A
+        num or heading that follows the children may be missing then; if so,
+        the node's path and ID are rebuilt and its descendants relinked to them.
+        """
+        node = frame.node
+        num = self._get_text_content(metadata, "num")
+        heading = self._get_text_content(metadata, "heading")
+        if num == node.num and heading == node.heading:
+            return
+
+        old_path, old_id = node.path, node.id
+        node.num = num
+        node.heading = heading
+        node.path = self._build_path(frame.parent_path, node.node_type, num, heading)
+        node.id = self._build_citation_id(node.node_type, num, node.identifier, frame.citation)
+        _relink(node.children, old_path, node.path, old_id, node.id)
+
+    def _build_path(
+        self,
+        parent_path: Optional[PathLink],
+        node_type: NodeType,
+        num: Optional[str],
+        heading: Optional[str],
+    ) -> Optional[PathLink]:
+        """Build a node's hierarchical path: its segment linked to the parent's path."""
+        if heading:
+            return PathLink(parent_path, f"{TYPE_LABELS[node_type]}: {heading}")
+        if num:
+            return PathLink(parent_path, f"{TYPE_LABELS[node_type]} {num}")
+        return parent_path
+
+    def _close_node(self, frame: _Frame) -> LegalNode:
+        """Finish a frame's LegalNode once its element has been fully read."""
+        elem = frame.elem
+        metadata = self._find_metadata_children(elem)
+
+        # Leaf elements have not been opened yet (no structural child did it)
+        if frame.node is None:
+            self._open_node(frame, metadata)
+        else:
+            self._update_node(frame, metadata)
+        node = frame.node
+
+        # Extract text content once; the status and reference scans reuse it
+        node.text = self._extract_text(elem, metadata)
+
+        # Determine status
+        node.status = self._determine_status(elem, node.text)
+
+        # Extract cross-references (deferred to worker processes if enabled)
+        # Nodes without text keep the default empty references
+        if node.text:
+            if self.workers is not None and self.workers > 1:
+                self._pending_references.append(node)
+            else:
+                node.references = self._extract_references(node.text)
+
+        # Track repealed sections
+        if node.node_type == NodeType.SECTION and node.status == NodeStatus.REPEALED:
+            self.repealed_sections.append(node.id)
+
+        # All children have been appended; a tuple has no spare capacity
+        node.children = tuple(node.children)
 
         return node
 
-    def _get_text_content(self, elem: etree._Element, child_name: str) -> Optional[str]:
+    def _extract_references(self, text: str) -> list[Reference]:
+        """
+        Extract cross-references, scanning each distinct text once per parse.
+
+        Nodes with identical text get their own Reference objects, pointing
+        at their own text.
+        """
+        cached = self._reference_cache.get(text)
+        if cached is None:
+            references = self._reference_cache[text] = extract_references(text)
+            return references
+        return [
+            Reference(
+                target_section=ref.target_section,
+                reference_type=ref.reference_type,
+                source_text=text,
+                context_start=ref.context_start,
+                context_end=ref.context_end,
+            )
+            for ref in cached
+        ]
+
+    def _extract_references_parallel(self, executor: ProcessPoolExecutor, nodes: list[LegalNode]) -> None:
+        """Extract cross-references for the given nodes in a process pool."""
+        spans = executor.map(
+            _reference_spans,
+            [node.text for node in nodes],
+            chunksize=REFERENCE_CHUNK_SIZE,
+        )
+        for node, node_spans in zip(nodes, spans):
+            node.references = [
+                Reference(
+                    target_section=sys.intern(section),
+                    reference_type=sys.intern(ref_type),
+                    source_text=node.text,
+                    context_start=start,
+                    context_end=end,
+                )
+                for section, ref_type, start, end in node_spans
+            ]
+
+    def _find_metadata_children(self, elem: etree._Element) -> dict[str, etree._Element]:
+        """
+        Collect an element's num, heading and content children in one pass.
+
+        Returns the first child of each kind, keyed by local name.
+        """
+        tags = self._metadata_tags
+        metadata: dict[str, etree._Element] = {}
+        for child in elem:
+            name = tags.get(child.tag)
+            if name is not None and name not in metadata:
+                metadata[name] = child
+        return metadata
+
+    def _get_text_content(self, metadata: dict[str, etree._Element], child_name: str) -> Optional[str]:
         """Get the text content of a child element."""
-        # Try with namespace
-        child = elem.find(f"uslm:{child_name}", NAMESPACES)
-        if child is None:
-            child = elem.find(child_name)
+        child = metadata.get(child_name)
 
         if child is not None:
             # Get all text including tail
@@ -231,19 +559,24 @@ class USLMParser:
             return text if text else None
         return None
 
-    def _determine_status(self, elem: etree._Element) -> NodeStatus:
-        """Determine the status of a node (active, repealed, etc.)."""
-        # Check status attribute
-        status_attr = elem.get("status", "").lower()
-        if "repeal" in status_attr:
-            return NodeStatus.REPEALED
-        if "expired" in status_attr:
-            return NodeStatus.EXPIRED
-        if "reserved" in status_attr:
-            return NodeStatus.RESERVED
+    def _determine_status(self, elem: etree._Element, text: str) -> NodeStatus:
+        """Determine the status of a node (active, repealed, etc.) from its attribute and extracted text."""
+        # Check status attribute: exact values first, then substrings of free-form values
+        status_attr = elem.get("status")
+        if status_attr:
+            status_attr = status_attr.lower()
+            status = STATUS_ATTRIBUTE_MAP.get(status_attr)
+            if status is not None:
+                return status
+            if "repeal" in status_attr:
+                return NodeStatus.REPEALED
+            if "expired" in status_attr:
+                return NodeStatus.EXPIRED
+            if "reserved" in status_attr:
+                return NodeStatus.RESERVED
 
         # Check text content for [Repealed] markers
-        text = self._extract_text(elem).lower()
+        text = text.lower()
         if "[repealed" in text or "repealed." in text:
             return NodeStatus.REPEALED
         if "[expired" in text:
@@ -251,7 +584,7 @@ class USLMParser:
 
         return NodeStatus.ACTIVE
 
-    def _extract_text(self, elem: etree._Element) -> str:
+    def _extract_text(self, elem: etree._Element, metadata: dict[str, etree._Element]) -> str:
         """
         Extract and clean the text content from an element.
 
@@ -260,47 +593,39 @@ class USLMParser:
         - Tables (converted to markdown)
         - Removal of structural child elements
         """
-        text_parts = []
-
         # Get direct content element
-        content = elem.find("uslm:content", NAMESPACES)
-        if content is None:
-            content = elem.find("content")
+        content = metadata.get("content")
 
         if content is not None:
-            text_parts.append(self._element_to_text(content))
+            text = self._element_to_text(content)
         else:
-            # Get text from the element itself, excluding structural children
-            for child in elem:
-                child_tag = etree.QName(child.tag).localname if isinstance(child.tag, str) else child.tag
-                # Skip structural elements and metadata elements
+            # Direct text, then the element's own text children, excluding
+            # structural and metadata elements. Empty parts and extra spaces
+            # are dropped by the whitespace normalization in _clean_text.
+            text_parts = [elem.text or ""]
+            for child in elem.iterchildren(etree.Element):
+                child_tag = _local(child.tag)
                 if child_tag not in ELEMENT_TO_NODE_TYPE and child_tag not in {"num", "heading", "meta"}:
                     text_parts.append(self._element_to_text(child))
-
-            # Also get direct text
-            if elem.text:
-                text_parts.insert(0, elem.text.strip())
+            text = " ".join(text_parts)
 
         # Clean up the text
-        text = " ".join(filter(None, text_parts))
-        text = self._clean_text(text)
-        return text
+        return self._clean_text(text)
 
     def _element_to_text(self, elem: etree._Element) -> str:
         """
         Convert an element to text, handling special cases like tables.
         """
         # Check if this is a table
-        tag = etree.QName(elem.tag).localname if isinstance(elem.tag, str) else elem.tag
+        tag = _local(elem.tag)
 
         if tag == "table":
             return self._table_to_markdown(elem)
 
         # Check for nested table
-        table = elem.find(".//table")
-        if table is None:
-            table = elem.find(".//{http://www.w3.org/1999/xhtml}table")
-        if table is not None:
+        tables = FIND_NESTED_TABLE(elem)
+        if tables:
+            table = tables[0]
             # Get text before and after table
             pre_text = elem.text or ""
             table_text = self._table_to_markdown(table)
@@ -312,121 +637,210 @@ class USLMParser:
             post_text = " ".join(post_parts)
             return f"{pre_text}\n{table_text}\n{post_text}".strip()
 
-        # Regular text extraction
-        return "".join(elem.itertext())
+        # Regular text extraction, serialized by libxml2 in one call (same as
+        # "".join(elem.itertext()))
+        return etree.tostring(elem, method="text", encoding="unicode", with_tail=False)
 
     def _table_to_markdown(self, table: etree._Element) -> str:
         """
         Convert an HTML table to markdown format.
         """
-        rows = []
+        # Rows are formatted as they are read and joined once at the end. The
+        # first row is the header; later rows are padded to its width.
+        md_lines: list[str] = []
+        width = 0
+
+        # Find all rows (tr elements, in any namespace); lxml matches the tags in C
+        for tr in table.iter("{*}tr"):
+            cells = [
+                "".join(cell.itertext()).strip().replace("|", "\\|")  # Escape pipes
+                for cell in tr.iterchildren("{*}th", "{*}td")
+            ]
+            if not cells:
+                continue
 
-        # Find all rows (tr elements)
-        for tr in table.iter():
-            tr_tag = etree.QName(tr.tag).localname if isinstance(tr.tag, str) else tr.tag
-            if tr_tag != "tr":
+            if not md_lines:
+                # Header row and separator
+                width = len(cells)
+                md_lines.append("| " + " | ".join(cells) + " |")
+                md_lines.append("| " + " | ".join(["---"] * width) + " |")
                 continue
 
-            cells = []
-            for cell in tr:
-                cell_tag = etree.QName(cell.tag).localname if isinstance(cell.tag, str) else cell.tag
-                if cell_tag in ("th", "td"):
-                    cell_text = "".join(cell.itertext()).strip()
-                    cell_text = cell_text.replace("|", "\\|")  # Escape pipes
-                    cells.append(cell_text)
-
-            if cells:
-                rows.append(cells)
-
-        if not rows:
-            return ""
-
-        # Build markdown table
-        md_lines = []
-
-        # Header row
-        if rows:
-            md_lines.append("| " + " | ".join(rows[0]) + " |")
-            # Separator
-            md_lines.append("| " + " | ".join(["---"] * len(rows[0])) + " |")
-            # Data rows
-            for row in rows[1:]:
-                # Pad row if needed
-                while len(row) < len(rows[0]):
-                    row.append("")
-                md_lines.append("| " + " | ".join(row) + " |")
+            # Data row, padded if needed
+            if len(cells) < width:
+                cells.extend([""] * (width - len(cells)))
+            md_lines.append("| " + " | ".join(cells) + " |")
 
         return "\n".join(md_lines)
 
     def _clean_text(self, text: str) -> str:
         """Clean up extracted text."""
-        # Decode HTML entities
+        # Decode HTML entities (html.unescape returns text without "&" as-is)
         text = html.unescape(text)
 
-        # Normalize whitespace
-        text = re.sub(r"\s+", " ", text)
+        # Collapse whitespace runs and trim the ends in one C-level pass
+        # (str.split() and the regex \s agree on what counts as whitespace)
+        return " ".join(text.split())
 
-        # Remove leading/trailing whitespace
-        text = text.strip()
+    def _citation_parts(
+        self, identifier: str, parent: Optional[_CitationParts]
+    ) -> Optional[_CitationParts]:
+        """
+        Parse a /us/usc identifier path into the parts used for its citation ID.
+
+        A child's identifier is normally its parent's plus one segment
+        (/us/usc/t26/s162 -> /us/usc/t26/s162/a), so the parent's parts are
+        extended with the new segments instead of re-splitting the whole path.
+
+        Returns None if the identifier is not a /us/usc path.
+        """
+        parent_identifier = parent[0] if parent is not None else ""
+        if (
+            parent is not None
+            and identifier.startswith(parent_identifier + "/")
+            and not parent_identifier.endswith("/")
+            and not identifier.endswith("/")
+        ):
+            _, count, section_parts, in_section = parent
+            segments = identifier[len(parent_identifier) + 1:].split("/")
+            count += len(segments)
+        else:
+            # Format: /us/usc/t26/s162/a -> 26 USC 162(a)
+            parts = identifier.strip("/").split("/")
+            if len(parts) < 3 or parts[0] != "us" or parts[1] != "usc":
+                return None
+            count, section_parts, in_section = len(parts), (), False
+            segments = parts[3:]  # Skip us/usc/t26
+
+        for part in segments:
+            # Extract section number from parts like "s162", "s25A"
+            if part.startswith("s"):
+                in_section = True
+                section_parts += (part[1:],)  # Remove 's' prefix
+            elif part.startswith(("ch", "pt")):
+                # Chapter, part (subtitle "st", subchapter "sch" and subpart
+                # "spt" segments are taken by the "s" branch above)
+                continue
+            elif in_section:
+                # Subsection/paragraph (a, b, 1, 2, etc.)
+                section_parts += (f"({part})",)
 
-        return text
+        return identifier, count, section_parts, in_section
 
     def _build_citation_id(
-        self, node_type: NodeType, num: Optional[str], identifier: str
+        self,
+        node_type: NodeType,
+        num: Optional[str],
+        identifier: str,
+        citation: Optional[_CitationParts] = None,
     ) -> str:
         """
         Build an official citation ID (e.g., "26 USC 162(a)").
+
+        ``citation`` is the identifier parsed by _citation_parts, if available.
         """
         if not identifier:
             return f"26 USC {num or 'unknown'}"
 
-        # Parse the identifier path
-        # Format: /us/usc/t26/s162/a -> 26 USC 162(a)
-        parts = identifier.strip("/").split("/")
-
-        if len(parts) >= 4 and parts[0] == "us" and parts[1] == "usc":
-            # Extract section number from parts like "s162", "s25A"
-            section_parts = []
-            in_section = False
-
-            for part in parts[3:]:  # Skip us/usc/t26
-                if part.startswith("s"):
-                    in_section = True
-                    section_parts.append(part[1:])  # Remove 's' prefix
-                elif part.startswith("st"):
-                    # Subtitle
-                    continue
-                elif part.startswith("ch"):
-                    # Chapter
-                    continue
-                elif part.startswith("sch"):
-                    # Subchapter
-                    continue
-                elif part.startswith("pt"):
-                    # Part
-                    continue
-                elif part.startswith("spt"):
-                    # Subpart
-                    continue
-                elif in_section:
-                    # Subsection/paragraph (a, b, 1, 2, etc.)
-                    section_parts.append(f"({part})")
+        if citation is None or citation[0] != identifier:
+            citation = self._citation_parts(identifier, None)
 
-            if section_parts:
+        if citation is not None:
+            _, count, section_parts, _ = citation
+            if count >= 4 and section_parts:
                 return f"26 USC {''.join(section_parts)}"
 
         # Fallback
         if num:
             # Clean up num (remove "Sec. " prefix if present)
-            clean_num = re.sub(r"^Sec\.?\s*", "", num)
+            clean_num = SEC_PREFIX_PATTERN.sub("", num)
             return f"26 USC {clean_num}"
 
         return f"26 USC {identifier}"
 
 
+def _relink(
+    children: list[Optional[LegalNode]],
+    old_path: Optional[PathLink],
+    new_path: Optional[PathLink],
+    old_id: str,
+    new_id: str,
+) -> None:
+    """
+    Point the subtrees built under a node's old path and ID at the new ones.
+
+    Each descendant either shares its parent's path or adds one segment to it,
+    so paths are rebuilt top-down, keeping the segments. Chapter placeholders
+    (None) are skipped; _merge_chapters re-anchors those chapters when they arrive.
+    """
+    for child in children:
+        if child is not None and child.parent_id == old_id:
+            child.parent_id = new_id
+
+    stack = [(child, old_path, new_path) for child in children]
+    while stack:
+        node, old_parent_path, new_parent_path = stack.pop()
+        if node is None:
+            continue
+        path = node.path
+        if path is old_parent_path:
+            node.path = new_parent_path
+        else:
+            node.path = PathLink(new_parent_path, path.segment)
+        stack.extend((child, path, node.path) for child in node.children)
+
+
+def _path_depth(path: Optional[PathLink]) -> int:
+    """Number of segments in a path."""
+    depth = 0
+    while path is not None:
+        depth += 1
+        path = path.parent
+    return depth
+
+
+def _reanchor(node: LegalNode, parent_depth: int, parent_path: Optional[PathLink]) -> None:
+    """
+    Attach a subtree parsed in a worker process to its parent's path in this process.
+
+    The subtree's paths end in a copy of the parent path, so the links that
+    belong to it are found by position: a node whose path has parent_depth
+    segments shares the parent's path, and the first link one segment deeper
+    is the subtree's own. Only those first links are repointed; every deeper
+    link is reached through them and stays as it is.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if _path_depth(node.path) == parent_depth:
+            node.path = parent_path
+            stack.extend(node.children)
+        else:
+            # The link was just unpickled and is not shared outside this
+            # subtree, so it can be repointed in place despite being frozen
+            object.__setattr__(node.path, "parent", parent_path)
+
+
+def _parse_subtree(
+    xml_bytes: bytes,
+    parent_id: Optional[str],
+    parent_path: Optional[PathLink],
+) -> tuple[LegalNode, int, int, list[str]]:
+    """
+    Parse one serialized subtree, such as a chapter (runs in worker processes).
+
+    Returns the subtree's root node with its section count, node count and
+    repealed section IDs, for the parent process to merge.
+    """
+    parser = USLMParser()
+    node = parser._stream(io.BytesIO(xml_bytes), _is_any_element, parent_id, parent_path)
+    return node, parser.sections_parsed, parser.total_nodes, parser.repealed_sections
+
+
 def parse_tax_code(
     xml_path: str | Path,
     max_sections: Optional[int] = None,
+    workers: Optional[int] = None,
 ) -> ParsedTaxCode:
     """
     Convenience function to parse a tax code XML file.
@@ -434,9 +848,10 @@ def parse_tax_code(
     Args:
         xml_path: Path to the USLM XML file.
         max_sections: Maximum number of sections to parse (for testing).
+        workers: Number of worker processes (see USLMParser).
 
     Returns:
         ParsedTaxCode containing the parsed hierarchy.
     """
-    parser = USLMParser(max_sections=max_sections)
+    parser = USLMParser(max_sections=max_sections, workers=workers)
     return parser.parse_file(xml_path)
@@ -0,0 +1,508 @@
+"""
+Tests for the USLM parser and tax code models.
+
+These tests verify:
+1. Cross-reference extraction from legal text
+2. Parsing and traversal of the bundled sample_usc26.xml
+3. JSON export of the parsed tree
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase, main, mock
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src import main as main_module  # noqa: E402
+from src.main import export_to_json  # noqa: E402
+from src.models import NodeStatus, NodeType, ParsedTaxCode, extract_references  # noqa: E402
+from src.parser import parse_tax_code  # noqa: E402
+
+SAMPLE_XML = PROJECT_ROOT / "sample_usc26.xml"
+
+
+class TestExtractReferences(TestCase):
+    """Test cross-reference detection."""
+
+    def _targets(self, text: str) -> list[tuple[str, str]]:
+        return [(ref.target_section, ref.reference_type) for ref in extract_references(text)]
+
+    def test_empty_text(self):
+        """Empty text has no references."""
+        self.assertEqual(extract_references(""), [])
+
+    def test_general_reference(self):
+        """Plain and abbreviated citations are general references."""
+        self.assertEqual(self._targets("allowed under section 162(a)(1)."), [("162(a)(1)", "general")])
+        self.assertEqual(self._targets("See Sec. 25A for details."), [("25A", "general")])
+
+    def test_keyword_case_and_word_boundary(self):
+        """The keyword matches in any case, but not inside a longer word."""
+        self.assertEqual(self._targets("SECTION 12A and sEcTiOn 5(b)"), [("12A", "general"), ("5(b)", "general")])
+        self.assertEqual(self._targets("under subsection 3 or bisection 4"), [])
+
+    def test_qualified_reference_types(self):
+        """Qualifying phrases set the reference type."""
+        self.assertEqual(self._targets("an individual (as defined in section 7703)"), [("7703", "definition")])
+        self.assertEqual(self._targets("subject to the provisions of section 274"), [("274", "subject_to")])
+        self.assertEqual(self._targets("except as provided in section 1(h)"), [("1(h)", "exception")])
+
+    def test_qualifier_must_precede_citation(self):
+        """Qualifiers match case-insensitively, only directly before the keyword."""
+        self.assertEqual(self._targets("Subject to Section 6013"), [("6013", "subject_to")])
+        self.assertEqual(
+            self._targets("as defined in paragraph (2) of section 152"),
+            [("152", "general")],
+        )
+
+    def test_dedup_by_section_and_type(self):
+        """Repeats are dropped, but one section may be cited with different types."""
+        self.assertEqual(
+            self._targets("under section 152, see section 152, as defined in section 152"),
+            [("152", "general"), ("152", "definition")],
+        )
+
+    def test_section_pairs(self):
+        """Both sections of a pair are extracted."""
+        self.assertEqual(
+            self._targets("sections 162 and 274 apply"),
+            [("162", "general"), ("274", "general")],
+        )
+
+    def test_pair_requires_bare_first_section(self):
+        """A trailing number after a subsection citation is not a second section."""
+        self.assertEqual(
+            self._targets("the limitation under section 26(a) or 15 percent of"),
+            [("26(a)", "general")],
+        )
+
+    def test_repeated_text_returns_fresh_list(self):
+        """Each call hands the caller its own list."""
+        text = "except as provided in section 7701"
+        first = extract_references(text)
+        first.clear()
+        self.assertEqual(self._targets(text), [("7701", "exception")])
+
+    def test_context_window(self):
+        """Context is the text surrounding the match."""
+        refs = extract_references("The deduction allowed under section 162 is limited.")
+        self.assertEqual(refs[0].context, "...The deduction allowed under section 162 is limited....")
+
+
+class TestParseSample(TestCase):
+    """Test parsing and traversal of sample_usc26.xml."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parsed = parse_tax_code(SAMPLE_XML)
+
+    def test_counts(self):
+        """Node, section and repealed counts match the sample document."""
+        self.assertEqual(self.parsed.total_nodes, 125)
+        self.assertEqual(self.parsed.total_sections, 43)
+        self.assertEqual(self.parsed.repealed_sections[:2], ["26 USC 3", "26 USC 4"])
+
+    def test_get_all_sections_in_document_order(self):
+        """Sections are returned in document order."""
+        sections = self.parsed.get_all_sections()
+        self.assertEqual(len(sections), 43)
+        self.assertEqual([s.id for s in sections[:3]], ["26 USC 1", "26 USC 2", "26 USC 3"])
+        self.assertTrue(all(s.node_type == NodeType.SECTION for s in sections))
+
+    def test_get_section(self):
+        """Sections are found by number, and unknown numbers return None."""
+        section = self.parsed.get_section("24")
+        self.assertIsNotNone(section)
+        self.assertEqual(section.heading, "Child tax credit")
+        self.assertIsNone(self.parsed.get_section("99999"))
+
+    def test_get_node(self):
+        """Any node is found by its citation ID through the index."""
+        node = self.parsed.get_node("26 USC 21(b)(1)")
+        self.assertIs(node, self.parsed.root.find_by_id("26 USC 21(b)(1)"))
+        self.assertIsNone(self.parsed.get_node("26 USC 99999"))
+
+    def test_find_by_id_nested(self):
+        """Nested nodes are found by their citation ID."""
+        node = self.parsed.root.find_by_id("26 USC 21(b)(1)")
+        self.assertIsNotNone(node)
+        self.assertEqual(node.parent_id, "26 USC 21(b)")
+        self.assertEqual(node.node_type, NodeType.PARAGRAPH)
+
+    def test_path_shared_with_parent(self):
+        """A node's path links to its parent's path instead of copying it."""
+        node = self.parsed.get_node("26 USC 21(b)(1)")
+        parent = self.parsed.get_node(node.parent_id)
+        self.assertIs(node.path.parent, parent.path)
+        self.assertTrue(node.hierarchical_path.startswith(parent.hierarchical_path + " > "))
+
+    def test_container_and_content_flags(self):
+        """Container and content flags follow the node type."""
+        root = self.parsed.root
+        section = self.parsed.get_section("24")
+        self.assertEqual((root.is_container, root.is_content), (True, False))
+        self.assertEqual((section.is_container, section.is_content), (False, True))
+
+    def test_leaf_nodes(self):
+        """Leaf nodes have no children and keep document order."""
+        leaves = self.parsed.root.get_all_leaf_nodes()
+        self.assertTrue(all(not leaf.children for leaf in leaves))
+        self.assertEqual(leaves[0].id, "26 USC 1(a)")
+
+    def test_flat_node_store(self):
+        """The flat store lists every node in document order with CSR child ranges."""
+        nodes = list(self.parsed.iter_nodes())
+        self.assertEqual(len(nodes), self.parsed.total_nodes)
+        self.assertIs(nodes[0], self.parsed.root)
+        self.assertEqual([n.id for n in nodes if n.node_type == NodeType.SECTION],
+                         [s.id for s in self.parsed.get_all_sections()])
+        for position, node in enumerate(nodes):
+            children = [self.parsed.nodes[i] for i in self.parsed.child_positions(position)]
+            self.assertEqual([c.id for c in children], [c.id for c in node.children])
+
+    def test_count_by_type(self):
+        """Type counts cover every node and agree with the section list."""
+        counts = self.parsed.count_by_type()
+        self.assertEqual(sum(counts.values()), self.parsed.total_nodes)
+        self.assertEqual(counts[NodeType.SECTION], self.parsed.total_sections)
+        self.assertEqual(counts[NodeType.TITLE], 1)
+        self.assertTrue(all(counts.values()))
+
+    def test_get_all_references(self):
+        """References are paired with the ID of the node they appear in."""
+        refs = self.parsed.get_all_references()
+        self.assertEqual(len(refs), 65)
+        self.assertEqual(refs[0][0], "26 USC 1(a)")
+        self.assertEqual(refs[0][1].target_section, "7703")
+        self.assertEqual(list(self.parsed.iter_all_references()), refs)
+
+    def _dumped_node(self, node_id: str) -> dict:
+        """Find a node's entry in the model_dump() of the parsed tree."""
+        stack = [self.parsed.model_dump()["root"]]
+        while stack:
+            dumped = stack.pop()
+            if dumped["id"] == node_id:
+                return dumped
+            stack.extend(dumped["children"])
+        raise KeyError(node_id)
+
+    def test_node_dump(self):
+        """Dumped nodes carry the fields and derived text, not the memo slots or type predicates."""
+        node = self.parsed.get_node("26 USC 21(b)(1)")
+        node.embedding_text  # fill the memo
+        dumped = self._dumped_node(node.id)
+        self.assertEqual(
+            set(dumped),
+            {"id", "identifier", "node_type", "num", "heading", "text", "status", "parent_id",
+             "children", "references", "hierarchical_path", "full_text", "embedding_text"},
+        )
+        self.assertEqual(dumped["embedding_text"], node.embedding_text)
+
+    def test_path_dump(self):
+        """Dumped nodes carry the joined path string, not the chain of path links."""
+        node = self.parsed.get_node("26 USC 21(b)(1)")
+        dumped = self._dumped_node(node.id)
+        self.assertNotIn("path", dumped)
+        self.assertEqual(dumped["hierarchical_path"], node.hierarchical_path)
+
+    def test_reference_dump(self):
+        """Dumped references carry their context, not the source text and bounds."""
+        ref = self.parsed.get_node("26 USC 1(a)").references[0]
+        self.assertEqual(
+            self._dumped_node("26 USC 1(a)")["references"][0],
+            {"target_section": ref.target_section, "reference_type": ref.reference_type, "context": ref.context},
+        )
+
+    def test_dump_round_trip(self):
+        """Validating a dump, or its JSON, rebuilds paths and reference contexts."""
+        for restored in (ParsedTaxCode.model_validate(self.parsed.model_dump()),
+                         ParsedTaxCode.model_validate_json(self.parsed.model_dump_json())):
+            self.assertEqual(restored.model_dump(mode="json"), self.parsed.model_dump(mode="json"))
+            node = restored.get_node("26 USC 21(b)(1)")
+            self.assertIs(node.path.parent, restored.get_node(node.parent_id).path)
+            self.assertEqual(
+                [ref.context for _, ref in restored.iter_all_references()],
+                [ref.context for _, ref in self.parsed.iter_all_references()],
+            )
+
+    def test_parallel_reference_extraction(self):
+        """Extracting references in worker processes gives the same results."""
+        parallel = parse_tax_code(SAMPLE_XML, workers=2)
+        expected = [(node_id, ref.target_section, ref.reference_type, ref.context)
+                    for node_id, ref in self.parsed.iter_all_references()]
+        actual = [(node_id, ref.target_section, ref.reference_type, ref.context)
+                  for node_id, ref in parallel.iter_all_references()]
+        self.assertEqual(actual, expected)
+
+
+class TestStreamingParse(TestCase):
+    """Test the streaming parser on small hand-written documents."""
+
+    def _parse(self, xml: str, **kwargs):
+        with tempfile.TemporaryDirectory() as tmp:
+            xml_path = Path(tmp) / "doc.xml"
+            xml_path.write_text(xml)
+            return parse_tax_code(xml_path, **kwargs)
+
+    def test_root_without_main(self):
+        """Without a <main> element the first title is the root."""
+        parsed = self._parse(
+            '<doc><title identifier="/us/usc/t26"><num>Title 26</num>'
+            '<section identifier="/us/usc/t26/s1"><num>Sec. 1</num></section></title></doc>'
+        )
+        self.assertEqual(parsed.root.node_type, NodeType.TITLE)
+        self.assertEqual([c.id for c in parsed.root.children], ["26 USC 1"])
+
+    def test_root_without_main_skips_metadata_title(self):
+        """Without a <main> element, a <dc:title> in <meta> is not taken as the root."""
+        xml = SAMPLE_XML.read_text(encoding="utf-8")
+        parsed = self._parse(xml.replace("<main>", "<body>").replace("</main>", "</body>"))
+        self.assertIn("<dc:title>", xml.split("<main>")[0])
+        self.assertEqual(parsed.root.identifier, "/us/usc/t26")
+        self.assertEqual(parsed.total_nodes, 125)
+
+    def test_nested_structural_element_stays_text(self):
+        """Structural tags inside content are part of the text, not nodes."""
+        parsed = self._parse(
+            '<doc><main><title identifier="/us/usc/t26"><section identifier="/us/usc/t26/s1">'
+            '<content>See <paragraph>paragraph (1) of section 2</paragraph>.</content>'
+            '</section></title></main></doc>'
+        )
+        section = parsed.get_section("1")
+        self.assertEqual(section.children, ())
+        self.assertEqual(section.text, "See paragraph (1) of section 2.")
+        self.assertEqual(parsed.total_nodes, 2)
+
+    def test_heading_after_children(self):
+        """A heading after the structural children is kept, however far the parser has read ahead."""
+        sections = "".join(
+            f'<section identifier="/us/usc/t26/s{i}"><num>Sec. {i}</num><content>{"Text. " * 20}</content></section>'
+            for i in range(1, 500)
+        )
+        xml = (
+            '<doc><main><title identifier="/us/usc/t26"><chapter identifier="/us/usc/t26/ch1">'
+            f'{sections}<heading>Late heading</heading></chapter></title></main></doc>'
+        )
+        for parsed in (self._parse(xml), self._parse(xml, workers=2)):
+            chapter = parsed.root.children[0]
+            self.assertEqual(chapter.heading, "Late heading")
+            self.assertEqual(chapter.children[-1].hierarchical_path, "Chapter: Late heading > Section Sec. 499")
+
+    def test_table_rows_to_markdown(self):
+        """Table rows become markdown rows, with pipes in cells escaped."""
+        parsed = self._parse(
+            '<doc xmlns="http://xml.house.gov/schemas/uslm/1.0"><main><title identifier="/us/usc/t26">'
+            '<section identifier="/us/usc/t26/s1"><table><thead><tr><th>Rate</th><th>A|B</th></tr></thead>'
+            '<tbody><tr><td>10%</td><td>x</td></tr></tbody></table></section></title></main></doc>'
+        )
+        self.assertEqual(
+            parsed.get_section("1").text,
+            "| Rate | A\\|B | | --- | --- | | 10% | x |",
+        )
+
+    def test_nested_table_in_content(self):
+        """A table nested in content is converted, keeping the text around it."""
+        parsed = self._parse(
+            '<doc><main><title identifier="/us/usc/t26"><section identifier="/us/usc/t26/s1">'
+            '<content>Rates: <table><tr><th>Rate</th></tr><tr><td>10%</td></tr></table> apply.</content>'
+            '</section></title></main></doc>'
+        )
+        self.assertEqual(parsed.get_section("1").text, "Rates: | Rate | | --- | | 10% | apply.")
+
+    def test_comments_and_processing_instructions_dropped(self):
+        """Comments and processing instructions are not part of the text."""
+        parsed = self._parse(
+            '<doc><main><title identifier="/us/usc/t26">'
+            '<section identifier="/us/usc/t26/s1"><content>See <!-- note --> section 2.</content></section>'
+            '<section identifier="/us/usc/t26/s3">Direct <!-- note --> text<?pi x?></section>'
+            '</title></main></doc>'
+        )
+        self.assertEqual([s.text for s in parsed.get_all_sections()], ["See section 2.", "Direct text"])
+
+    def test_internal_entities_resolved(self):
+        """Entities declared in the document's DTD are expanded in the text."""
+        parsed = self._parse(
+            '<?xml version="1.0"?><!DOCTYPE doc [<!ENTITY ref "section 77">]>'
+            '<doc><main><title identifier="/us/usc/t26">'
+            '<section identifier="/us/usc/t26/s1">Direct &ref; text</section>'
+            '<section identifier="/us/usc/t26/s2"><content>See &ref; too.</content></section>'
+            '</title></main></doc>'
+        )
+        sections = parsed.get_all_sections()
+        self.assertEqual([s.text for s in sections], ["Direct section 77 text", "See section 77 too."])
+        self.assertEqual([[r.target_section for r in s.references] for s in sections], [["77"], ["77"]])
+
+    def test_repeated_text_gets_own_references(self):
+        """Nodes with identical text do not share Reference objects."""
+        parsed = self._parse(
+            '<doc><main><title identifier="/us/usc/t26">'
+            '<section identifier="/us/usc/t26/s1"><content>See section 7.</content></section>'
+            '<section identifier="/us/usc/t26/s2"><content>See section 7.</content></section>'
+            '</title></main></doc>'
+        )
+        first, second = (s.references[0] for s in parsed.get_all_sections())
+        self.assertIsNot(first, second)
+        self.assertEqual((first.target_section, first.context), (second.target_section, second.context))
+
+    def test_status_attribute(self):
+        """Exact and free-form status attribute values are recognized."""
+        parsed = self._parse(
+            '<doc><main><title identifier="/us/usc/t26">'
+            '<section identifier="/us/usc/t26/s1" status="Reserved"/>'
+            '<section identifier="/us/usc/t26/s2" status="transferredRepealed"/>'
+            '<section identifier="/us/usc/t26/s3"/></title></main></doc>'
+        )
+        self.assertEqual(
+            [s.status for s in parsed.get_all_sections()],
+            [NodeStatus.RESERVED, NodeStatus.REPEALED, NodeStatus.ACTIVE],
+        )
+        self.assertEqual(parsed.repealed_sections, ["26 USC 2"])
+
+    def test_citation_ids(self):
+        """Citation IDs are the same whether or not a child extends its parent's identifier."""
+        parsed = self._parse(
+            '<doc><main><title identifier="/us/usc/t26"><chapter identifier="/us/usc/t26/ch1">'
+            '<section identifier="/us/usc/t26/s25A"><subsection identifier="/us/usc/t26/s25A/b">'
+            '<paragraph identifier="/us/usc/t26/s25A/b/1"/></subsection>'
+            '<subsection identifier="/us/usc/t26/s25A/c/2"/></section>'
+            '<section identifier="/us/usc/t26/s26"><num>Sec. 26</num>'
+            '<subsection identifier="/us/usc/t26/s26/a"/></section></chapter></title></main></doc>'
+        )
+        self.assertEqual(
+            [n.id for n in parsed.iter_nodes()][2:],
+            ["26 USC 25A", "26 USC 25A(b)", "26 USC 25A(b)(1)", "26 USC 25A(c)(2)",
+             "26 USC 26", "26 USC 26(a)"],
+        )
+
+    def test_parallel_chapters_keep_document_order(self):
+        """Chapters parsed in worker processes are merged back in document order."""
+        xml = (
+            '<doc><main><title identifier="/us/usc/t26"><subtitle identifier="/us/usc/t26/stA">'
+            '<section identifier="/us/usc/t26/s1" status="repealed"/>'
+            '<chapter identifier="/us/usc/t26/stA/ch1"><heading>One</heading>'
+            '<section identifier="/us/usc/t26/s2" status="repealed"/></chapter>'
+            '<section identifier="/us/usc/t26/s3" status="repealed"/>'
+            '<chapter identifier="/us/usc/t26/stA/ch2"><heading>Two</heading>'
+            '<section identifier="/us/usc/t26/s4" status="repealed"><content>See section 1.</content></section>'
+            '</chapter></subtitle></title></main></doc>'
+        )
+        sequential = self._parse(xml)
+        parallel = self._parse(xml, workers=2)
+        self.assertEqual(parallel.repealed_sections, ["26 USC 1", "26 USC 2", "26 USC 3", "26 USC 4"])
+        self.assertEqual(parallel.repealed_sections, sequential.repealed_sections)
+        self.assertEqual((parallel.total_nodes, parallel.total_sections), (sequential.total_nodes, 4))
+        self.assertEqual(
+            [(n.id, n.parent_id, n.hierarchical_path) for n in parallel.iter_nodes()],
+            [(n.id, n.parent_id, n.hierarchical_path) for n in sequential.iter_nodes()],
+        )
+        self.assertEqual(parallel.get_section("4").references[0].target_section, "1")
+
+    def test_parallel_chapters_share_late_parent_path(self):
+        """Chapters from worker processes hang on the parent's final path, even one completed later."""
+        xml = (
+            '<doc><main><title identifier="/us/usc/t26"><heading>T</heading>'
+            '<subtitle identifier="/us/usc/t26/stA">'
+            '<chapter identifier="/us/usc/t26/stA/ch1"><section identifier="/us/usc/t26/s1"><num>Sec. 1</num></section></chapter>'
+            '<chapter identifier="/us/usc/t26/stA/ch2"><heading>Two</heading>'
+            '<section identifier="/us/usc/t26/s2"/></chapter>'
+            '<heading>Late</heading></subtitle></title></main></doc>'
+        )
+        sequential = self._parse(xml)
+        parallel = self._parse(xml, workers=2)
+        subtitle = parallel.root.children[0]
+        first, second = subtitle.children
+        self.assertEqual(first.hierarchical_path, "Title: T > Subtitle: Late")
+        self.assertEqual(parallel.get_section("1").hierarchical_path, "Title: T > Subtitle: Late > Section Sec. 1")
+        self.assertIs(first.path, subtitle.path)
+        self.assertIs(second.path.parent, subtitle.path)
+        self.assertEqual(
+            [(n.id, n.parent_id, n.hierarchical_path) for n in parallel.iter_nodes()],
+            [(n.id, n.parent_id, n.hierarchical_path) for n in sequential.iter_nodes()],
+        )
+
+    def test_missing_title(self):
+        """A document without a title element is rejected."""
+        with self.assertRaises(ValueError):
+            self._parse("<doc><main><section/></main></doc>")
+
+
+class TestExportToJson(TestCase):
+    """Test the streamed JSON export."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.parsed = parse_tax_code(SAMPLE_XML)
+        cls.raw = cls._export(cls.parsed)
+        cls.data = json.loads(cls.raw)
+
+    @staticmethod
+    def _export(parsed) -> str:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_path = Path(tmp) / "export.json"
+            with contextlib.redirect_stdout(io.StringIO()):
+                export_to_json(parsed, output_path)
+            return output_path.read_text(encoding="utf-8")
+
+    def test_export_header(self):
+        """Top-level statistics are exported."""
+        self.assertEqual(self.data["total_nodes"], self.parsed.total_nodes)
+        self.assertEqual(self.data["repealed_sections"], self.parsed.repealed_sections)
+
+    def test_export_indented(self):
+        """The streamed export is laid out like json.dump(..., indent=2)."""
+        self.assertEqual(self.raw, json.dumps(self.data, indent=2, ensure_ascii=False))
+
+    def test_export_non_ascii(self):
+        """Non-ASCII text is written as UTF-8, the same with or without orjson."""
+        with tempfile.TemporaryDirectory() as tmp:
+            xml_path = Path(tmp) / "doc.xml"
+            xml_path.write_text(
+                '<doc><main><title identifier="/us/usc/t26"><heading>Title — 26</heading>'
+                '<section identifier="/us/usc/t26/s1"><content>See § 2 — and section 3.</content></section>'
+                '</title></main></doc>',
+                encoding="utf-8",
+            )
+            parsed = parse_tax_code(xml_path)
+        raw = self._export(parsed)
+        with mock.patch.object(main_module, "_json_bytes", main_module._stdlib_json_bytes):
+            stdlib_raw = self._export(parsed)
+        self.assertIn("See § 2 — and", raw)
+        self.assertEqual(stdlib_raw, raw)
+        self.assertEqual(raw, json.dumps(json.loads(raw), indent=2, ensure_ascii=False))
+
+    def test_export_mirrors_hierarchy(self):
+        """Every node is exported, nested the same way as the parsed tree."""
+        count = 0
+        for exported, node in self._pairs():
+            count += 1
+            self.assertEqual(exported["id"], node.id)
+            self.assertEqual(exported["type"], node.node_type.value)
+            self.assertEqual(len(exported["references"]), len(node.references))
+            self.assertEqual(len(exported["children"]), len(node.children))
+        self.assertEqual(count, self.parsed.total_nodes)
+
+    def test_export_truncates_text(self):
+        """Long node text is truncated to a 200 character preview."""
+        long_text = [
+            exported["text"]
+            for exported, node in self._pairs()
+            if len(node.text) > 200
+        ]
+        self.assertTrue(long_text)
+        self.assertTrue(all(len(text) == 203 and text.endswith("...") for text in long_text))
+
+    def _pairs(self):
+        stack = [(self.data["root"], self.parsed.root)]
+        while stack:
+            exported, node = stack.pop()
+            yield exported, node
+            stack.extend(zip(exported["children"], node.children))
+
+
+if __name__ == "__main__":
+    main()